@@ -8,14 +8,179 @@ Computes metrics and analytics from DuckDB data:
 - Time series data for charting
 """
 
+import argparse
+import asyncio
+import copy
 import duckdb
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
+import logging
 from pathlib import Path
-from typing import Dict, List, Any
-import json
+import threading
+from typing import Dict, FrozenSet, List, Any, Optional
+import orjson
+
+from ingestion import run_materialized_sql
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# Query text is kept constant (limits are bound as parameters) so DuckDB
+# can reuse the prepared plan across calls instead of re-parsing per limit.
+_NO_LIMIT = 2**31 - 1
+
+_OVERVIEW_SQL = """
+    SELECT 
+        (SELECT COUNT(*) FROM agencies_parsed),
+        (SELECT COUNT(*) FROM corrections_parsed),
+        (SELECT COUNT(*) FROM cfr_references),
+        (SELECT MIN(year) FROM corrections_parsed),
+        (SELECT MAX(year) FROM corrections_parsed)
+"""
+
+_AGENCY_METRICS_SQL = """
+    SELECT 
+        slug,
+        name,
+        short_name,
+        parent_slug,
+        cfr_reference_count,
+        child_count,
+        total_corrections,
+        years_with_corrections,
+        first_correction_year,
+        last_correction_year,
+        avg_correction_lag_days,
+        rvi
+    FROM agency_metrics
+    ORDER BY total_corrections DESC
+    LIMIT ?
+"""
+
+_TITLE_TRENDS_SQL = """
+    SELECT 
+        title,
+        correction_count,
+        years_active,
+        first_year,
+        last_year,
+        avg_lag_days
+    FROM correction_trends_by_title
+    ORDER BY correction_count DESC
+    LIMIT ?
+"""
+
+_TOP_AGENCIES_BY_RVI_SQL = """
+    SELECT 
+        slug,
+        name,
+        short_name,
+        total_corrections,
+        cfr_reference_count,
+        rvi
+    FROM agency_metrics
+    WHERE total_corrections > 0
+    ORDER BY rvi DESC
+    LIMIT ?
+"""
+
+_TIME_SERIES_SQL = """
+    SELECT 
+        year,
+        month,
+        correction_count,
+        avg_lag_days
+    FROM correction_time_series
+    ORDER BY year, month
+"""
+
+_AGENCY_DETAIL_SQL = """
+    SELECT 
+        slug,
+        name,
+        short_name,
+        parent_slug,
+        cfr_reference_count,
+        child_count,
+        total_corrections,
+        years_with_corrections,
+        first_correction_year,
+        last_correction_year,
+        avg_correction_lag_days,
+        rvi
+    FROM agency_metrics
+    WHERE slug = ?
+"""
+
+_AGENCY_DETAILS_SQL = """
+    SELECT 
+        slug,
+        name,
+        short_name,
+        parent_slug,
+        cfr_reference_count,
+        child_count,
+        total_corrections,
+        years_with_corrections,
+        first_correction_year,
+        last_correction_year,
+        avg_correction_lag_days,
+        rvi
+    FROM agency_metrics
+    WHERE slug IN (SELECT UNNEST(?::VARCHAR[]))
+"""
+
+_CORRECTIONS_FOR_AGENCY_SQL = """
+    SELECT 
+        c.ecfr_id,
+        c.cfr_reference,
+        c.title,
+        c.corrective_action,
+        c.error_occurred,
+        c.error_corrected,
+        c.lag_days,
+        c.year
+    FROM corrections_parsed c
+    INNER JOIN agency_titles at ON c.title = at.title
+    WHERE at.slug_id = (SELECT slug_id FROM agencies_parsed WHERE slug = ?)
+    ORDER BY c.year DESC, c.error_corrected DESC
+    LIMIT ?
+"""
 
 
 class ECFRAnalytics:
-    """Analytics engine for eCFR data."""
+    """
+    Analytics engine for eCFR data.
+    
+    Connection lifecycle:
+    - All instances pointed at the same database file share one read-only
+      DuckDB handle. The first connect() opens it (loading the catalog and
+      the set of valid agency slugs); later connect() calls reuse it.
+    - Queries run on a cursor per thread, created lazily on that handle.
+    - close() closes the calling thread's cursor and releases the instance's
+      claim on the handle. The handle, and its file lock, is closed when the
+      last connected instance closes, so the file can then be opened
+      writable (e.g. by ECFRIngestion) in the same process.
+    - refresh_materialized() needs a writable connection, so it refuses to
+      run while any other instance holds the shared handle.
+    - Summary reports are cached per database for as long as the shared
+      handle is open. While it is held no other process can write the file,
+      and refresh_materialized() can only run once it has been closed, so
+      closing the handle is the single invalidation point.
+    """
+    
+    _connections: Dict[str, duckdb.DuckDBPyConnection] = {}
+    _connection_users: Dict[str, int] = {}
+    _connections_lock = threading.Lock()
+    
+    # Valid agency slugs per database, loaded when the handle is opened so
+    # unknown slugs (e.g. from URLs) are rejected without a query.
+    _known_slugs: Dict[str, FrozenSet[str]] = {}
+    
+    _summary_reports: Dict[str, Dict[str, Any]] = {}
     
     def __init__(self, db_path: str = 'ecfr_analytics.duckdb'):
         """
@@ -25,17 +190,117 @@ class ECFRAnalytics:
             db_path: Path to DuckDB database
         """
         self.db_path = db_path
-        self.conn = None
+        self._connected = False
+        self._local = threading.local()
+    
+    @property
+    def conn(self) -> Optional[duckdb.DuckDBPyConnection]:
+        """Shared connection for this database, or None if not connected."""
+        if not self._connected:
+            return None
+        return self._connections.get(self.db_path)
     
     def connect(self):
-        """Connect to DuckDB."""
-        self.conn = duckdb.connect(self.db_path, read_only=True)
-        print(f"✅ Connected to DuckDB: {self.db_path}")
+        """Connect to DuckDB, reusing an already open handle for the database."""
+        if self._connected:
+            return
+        
+        with self._connections_lock:
+            if self.db_path not in self._connections:
+                conn = duckdb.connect(self.db_path, read_only=True)
+                try:
+                    known_slugs = frozenset(
+                        row[0] for row in conn.execute("SELECT slug FROM agencies_parsed").fetchall()
+                    )
+                except Exception:
+                    conn.close()
+                    raise
+                self._connections[self.db_path] = conn
+                self._known_slugs[self.db_path] = known_slugs
+                logger.info("Connected to DuckDB: %s", self.db_path)
+            self._connection_users[self.db_path] = self._connection_users.get(self.db_path, 0) + 1
+        
+        self._connected = True
     
     def close(self):
-        """Close connection."""
-        if self.conn:
-            self.conn.close()
+        """Close this thread's cursor and release the shared handle."""
+        if not self._connected:
+            return
+        
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is not None:
+            cursor.close()
+        self._local.conn = None
+        self._local.cursor = None
+        self._connected = False
+        
+        with self._connections_lock:
+            self._connection_users[self.db_path] -= 1
+            if self._connection_users[self.db_path] == 0:
+                del self._connection_users[self.db_path]
+                self._known_slugs.pop(self.db_path, None)
+                self._summary_reports.pop(self.db_path, None)
+                self._connections.pop(self.db_path).close()
+    
+    def refresh_materialized(self):
+        """
+        Rebuild the materialized aggregate tables after new data lands.
+        
+        Runs duckdb_materialized.sql (via ingestion.run_materialized_sql) on
+        a short-lived writable connection. This instance is disconnected for
+        the duration and reconnected afterwards if it was connected.
+        
+        Raises:
+            RuntimeError: If other instances are connected to the database
+        """
+        was_connected = self._connected
+        self.close()
+        
+        try:
+            with self._connections_lock:
+                if self.db_path in self._connections:
+                    raise RuntimeError(
+                        f"Cannot refresh {self.db_path} while other readers are connected"
+                    )
+                
+                conn = duckdb.connect(self.db_path)
+                try:
+                    run_materialized_sql(conn)
+                finally:
+                    conn.close()
+        finally:
+            if was_connected:
+                self.connect()
+    
+    def _known_slug_set(self) -> FrozenSet[str]:
+        """Valid agency slugs for this database (loaded by connect())."""
+        if self.conn is None:
+            raise RuntimeError("Not connected to DuckDB; call connect() first")
+        known_slugs = self._known_slugs.get(self.db_path)
+        if known_slugs is None:
+            raise RuntimeError(f"Agency slugs not loaded for {self.db_path}")
+        return known_slugs
+    
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return this thread's cursor, replacing it if the handle was reopened."""
+        conn = self.conn
+        if conn is None:
+            raise RuntimeError("Not connected to DuckDB; call connect() first")
+        if getattr(self._local, 'conn', None) is not conn:
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+        return self._local.cursor
+    
+    def _fetch_records(self, query: str, params: List[Any] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a query and return its rows as dictionaries.
+        
+        Results are fetched as an Arrow table so DuckDB hands back columnar
+        buffers directly; rows are only built at the very end, and column
+        names come from the result schema. Queries run on the calling
+        thread's cursor so getters can safely run from multiple threads.
+        """
+        return self._cursor().execute(query, params).fetch_arrow_table().to_pylist()
     
     def get_agency_metrics(self, limit: int = None) -> List[Dict[str, Any]]:
         """
@@ -47,92 +312,38 @@ class ECFRAnalytics:
         Returns:
             List of agency metric dictionaries
         """
-        query = """
-            SELECT 
-                slug,
-                name,
-                short_name,
-                parent_slug,
-                cfr_reference_count,
-                child_count,
-                total_corrections,
-                years_with_corrections,
-                first_correction_year,
-                last_correction_year,
-                ROUND(avg_correction_lag_days, 1) as avg_correction_lag_days,
-                rvi
-            FROM agency_metrics
-            ORDER BY total_corrections DESC
-        """
-        
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        results = self.conn.execute(query).fetchall()
-        
-        columns = [
-            'slug', 'name', 'short_name', 'parent_slug', 
-            'cfr_reference_count', 'child_count', 'total_corrections',
-            'years_with_corrections', 'first_correction_year', 
-            'last_correction_year', 'avg_correction_lag_days', 'rvi'
-        ]
-        
-        return [dict(zip(columns, row)) for row in results]
+        return self._fetch_records(_AGENCY_METRICS_SQL, [limit or _NO_LIMIT])
     
     def get_correction_trends_yearly(self) -> List[Dict[str, Any]]:
         """Get yearly correction trends."""
-        results = self.conn.execute("""
+        return self._fetch_records("""
             SELECT 
                 year,
                 correction_count,
                 unique_titles,
-                ROUND(avg_lag_days, 1) as avg_lag_days,
+                avg_lag_days,
                 min_lag_days,
                 max_lag_days
             FROM correction_trends_yearly
             ORDER BY year
-        """).fetchall()
-        
-        columns = ['year', 'correction_count', 'unique_titles', 
-                   'avg_lag_days', 'min_lag_days', 'max_lag_days']
-        
-        return [dict(zip(columns, row)) for row in results]
+        """)
     
     def get_correction_trends_by_title(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get correction trends by CFR title."""
-        results = self.conn.execute(f"""
-            SELECT 
-                title,
-                correction_count,
-                years_active,
-                first_year,
-                last_year,
-                ROUND(avg_lag_days, 1) as avg_lag_days
-            FROM correction_trends_by_title
-            ORDER BY correction_count DESC
-            LIMIT {limit}
-        """).fetchall()
-        
-        columns = ['title', 'correction_count', 'years_active', 
-                   'first_year', 'last_year', 'avg_lag_days']
-        
-        return [dict(zip(columns, row)) for row in results]
+        return self._fetch_records(_TITLE_TRENDS_SQL, [limit])
     
     def get_time_series_data(self) -> List[Dict[str, Any]]:
         """Get monthly time series data for charting."""
-        results = self.conn.execute("""
-            SELECT 
-                year,
-                month,
-                correction_count,
-                ROUND(avg_lag_days, 1) as avg_lag_days
-            FROM correction_time_series
-            ORDER BY year, month
-        """).fetchall()
-        
-        columns = ['year', 'month', 'correction_count', 'avg_lag_days']
+        return self._fetch_records(_TIME_SERIES_SQL)
+    
+    def get_time_series_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get monthly time series data as one array per column.
         
-        return [dict(zip(columns, row)) for row in results]
+        Charting code consumes series column-wise, so this skips building
+        a dict per row and returns the NumPy arrays DuckDB produces.
+        """
+        return self._cursor().execute(_TIME_SERIES_SQL).fetchnumpy()
     
     def get_top_agencies_by_rvi(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -140,84 +351,42 @@ class ECFRAnalytics:
         
         High RVI indicates frequent changes relative to regulatory footprint.
         """
-        results = self.conn.execute(f"""
-            SELECT 
-                slug,
-                name,
-                short_name,
-                total_corrections,
-                cfr_reference_count,
-                rvi
-            FROM agency_metrics
-            WHERE total_corrections > 0
-            ORDER BY rvi DESC
-            LIMIT {limit}
-        """).fetchall()
-        
-        columns = ['slug', 'name', 'short_name', 'total_corrections', 
-                   'cfr_reference_count', 'rvi']
-        
-        return [dict(zip(columns, row)) for row in results]
+        return self._fetch_records(_TOP_AGENCIES_BY_RVI_SQL, [limit])
     
     def get_agency_detail(self, slug: str) -> Dict[str, Any]:
         """Get detailed metrics for a specific agency."""
-        result = self.conn.execute("""
-            SELECT 
-                slug,
-                name,
-                short_name,
-                parent_slug,
-                cfr_reference_count,
-                child_count,
-                total_corrections,
-                years_with_corrections,
-                first_correction_year,
-                last_correction_year,
-                ROUND(avg_correction_lag_days, 1) as avg_correction_lag_days,
-                rvi
-            FROM agency_metrics
-            WHERE slug = ?
-        """, [slug]).fetchone()
-        
-        if not result:
+        if slug not in self._known_slug_set():
             return None
         
-        columns = [
-            'slug', 'name', 'short_name', 'parent_slug', 
-            'cfr_reference_count', 'child_count', 'total_corrections',
-            'years_with_corrections', 'first_correction_year', 
-            'last_correction_year', 'avg_correction_lag_days', 'rvi'
-        ]
+        results = self._fetch_records(_AGENCY_DETAIL_SQL, [slug])
+        
+        return results[0] if results else None
+    
+    def get_agency_details(self, slugs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed metrics for several agencies in one query.
+        
+        Args:
+            slugs: Agency slugs to look up
+            
+        Returns:
+            Mapping of slug to agency metrics; unknown slugs are omitted
+        """
+        known_slugs = self._known_slug_set()
+        slugs = [slug for slug in slugs if slug in known_slugs]
+        if not slugs:
+            return {}
+        
+        results = self._fetch_records(_AGENCY_DETAILS_SQL, [slugs])
         
-        return dict(zip(columns, result))
+        return {row['slug']: row for row in results}
     
     def get_corrections_for_agency(self, slug: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get corrections related to an agency's CFR titles."""
-        results = self.conn.execute(f"""
-            WITH agency_titles AS (
-                SELECT DISTINCT title 
-                FROM cfr_references 
-                WHERE agency_slug = ?
-            )
-            SELECT 
-                c.ecfr_id,
-                c.cfr_reference,
-                c.title,
-                c.corrective_action,
-                c.error_occurred,
-                c.error_corrected,
-                c.lag_days,
-                c.year
-            FROM corrections_parsed c
-            INNER JOIN agency_titles at ON c.title = at.title
-            ORDER BY c.year DESC, c.error_corrected DESC
-            LIMIT {limit}
-        """, [slug]).fetchall()
-        
-        columns = ['ecfr_id', 'cfr_reference', 'title', 'corrective_action',
-                   'error_occurred', 'error_corrected', 'lag_days', 'year']
-        
-        return [dict(zip(columns, row)) for row in results]
+        if slug not in self._known_slug_set():
+            return []
+        
+        return self._fetch_records(_CORRECTIONS_FOR_AGENCY_SQL, [slug, limit])
     
     def calculate_word_counts(self) -> Dict[str, int]:
         """
@@ -229,104 +398,175 @@ class ECFRAnalytics:
         - Part-level reference: ~2,000 words
         - Section-level reference: ~500 words
         
-        This provides more accurate estimates than a flat rate.
+        This provides more accurate estimates than a flat rate. The
+        aggregation runs in DuckDB at ingestion time and is stored in the
+        agency_word_counts table (see duckdb_materialized.sql).
         """
-        results = self.conn.execute("""
-            SELECT 
-                agency_slug,
-                title,
-                chapter,
-                part,
-                COUNT(*) as ref_count
-            FROM cfr_references
-            GROUP BY agency_slug, title, chapter, part
-        """).fetchall()
-        
-        word_counts = {}
-        
-        for slug, title, chapter, part, ref_count in results:
-            if slug not in word_counts:
-                word_counts[slug] = 0
-            
-            # Tiered estimation based on specificity
-            if part:
-                # Part-level: most specific
-                word_counts[slug] += ref_count * 2000
-            elif chapter:
-                # Chapter-level: broader
-                word_counts[slug] += ref_count * 10000
-            else:
-                # Title-level: broadest
-                word_counts[slug] += ref_count * 50000
-        
-        return word_counts
+        return dict(self._cursor().execute("""
+            SELECT agency_slug, words
+            FROM agency_word_counts
+        """).fetchall())
+    
+    def get_overview(self) -> Dict[str, Any]:
+        """Get headline record counts and the correction year range."""
+        (total_agencies, total_corrections, total_cfr_references,
+         min_year, max_year) = self._cursor().execute(_OVERVIEW_SQL).fetchone()
+        
+        return {
+            'total_agencies': total_agencies,
+            'total_corrections': total_corrections,
+            'total_cfr_references': total_cfr_references,
+            'year_range': (min_year, max_year),
+        }
     
     def generate_summary_report(self) -> Dict[str, Any]:
-        """Generate a summary report of all analytics."""
+        """
+        Generate a summary report of all analytics.
+        
+        The report is cached while the shared handle is open (see the class
+        docstring); callers get a copy they are free to modify.
+        """
+        report = self._summary_reports.get(self.db_path)
+        if report is None:
+            report = self._build_summary_report()
+            self._summary_reports[self.db_path] = report
+        
+        return copy.deepcopy(report)
+    
+    def _build_summary_report(self) -> Dict[str, Any]:
+        """
+        Run the summary report queries.
+        
+        The five section queries are independent, so they run concurrently,
+        each on its worker thread's own cursor.
+        """
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            overview = executor.submit(self.get_overview)
+            top_by_corrections = executor.submit(self.get_agency_metrics, 10)
+            top_by_rvi = executor.submit(self.get_top_agencies_by_rvi, 10)
+            yearly_trends = executor.submit(self.get_correction_trends_yearly)
+            top_titles = executor.submit(self.get_correction_trends_by_title, 10)
+        
         return {
-            'overview': {
-                'total_agencies': self.conn.execute("SELECT COUNT(*) FROM agencies_parsed").fetchone()[0],
-                'total_corrections': self.conn.execute("SELECT COUNT(*) FROM corrections_parsed").fetchone()[0],
-                'total_cfr_references': self.conn.execute("SELECT COUNT(*) FROM cfr_references").fetchone()[0],
-                'year_range': self.conn.execute("""
-                    SELECT MIN(year), MAX(year) FROM corrections_parsed
-                """).fetchone(),
-            },
-            'top_agencies_by_corrections': self.get_agency_metrics(limit=10),
-            'top_agencies_by_rvi': self.get_top_agencies_by_rvi(limit=10),
-            'yearly_trends': self.get_correction_trends_yearly(),
-            'top_titles': self.get_correction_trends_by_title(limit=10),
+            'overview': overview.result(),
+            'top_agencies_by_corrections': top_by_corrections.result(),
+            'top_agencies_by_rvi': top_by_rvi.result(),
+            'yearly_trends': yearly_trends.result(),
+            'top_titles': top_titles.result(),
         }
     
-    def export_for_postgres(self, output_dir: Path):
+    async def generate_summary_report_async(self) -> Dict[str, Any]:
+        """
+        Generate the summary report without blocking the event loop.
+        
+        Runs generate_summary_report() in the default executor, so async
+        callers share its concurrent section queries and its cache.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate_summary_report)
+    
+    def _copy_to_json(self, view: str, output_file: Path) -> int:
+        """
+        Write a view to a JSON array file using DuckDB's COPY.
+        
+        Rows stream straight from DuckDB to disk without being
+        materialized in Python.
+        
+        DuckDB writes dates and timestamps as ISO strings (e.g.
+        "2005-12-02", "2026-10-15 21:48:38.661") rather than epoch
+        milliseconds, writes whole-number doubles without a decimal
+        point, and does not indent the output.
+        
+        Returns:
+            Number of rows exported
+        """
+        path = str(output_file).replace("'", "''")
+        cursor = self._cursor()
+        cursor.execute(f"COPY (SELECT * FROM {view}) TO '{path}' (FORMAT JSON, ARRAY true)")
+        return cursor.execute(f"SELECT COUNT(*) FROM {view}").fetchone()[0]
+    
+    def export_for_postgres(self, output_dir: Path) -> Dict[str, int]:
         """
         Export analytics data as JSON files for PostgreSQL import.
         
         Args:
             output_dir: Directory to write JSON export files
+            
+        Returns:
+            Number of rows exported per dataset
         """
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        print(f"\n📤 Exporting analytics to {output_dir}")
-        
-        # Export agencies
-        agencies = self.conn.execute("SELECT * FROM export_agencies").fetchdf()
-        agencies_file = output_dir / 'agencies.json'
-        agencies.to_json(agencies_file, orient='records', indent=2)
-        print(f"  ✅ Exported {len(agencies)} agencies")
-        
-        # Export corrections
-        corrections = self.conn.execute("SELECT * FROM export_corrections").fetchdf()
-        corrections_file = output_dir / 'corrections.json'
-        corrections.to_json(corrections_file, orient='records', indent=2)
-        print(f"  ✅ Exported {len(corrections)} corrections")
-        
-        # Export agency metrics
-        metrics = self.conn.execute("SELECT * FROM export_agency_metrics").fetchdf()
-        metrics_file = output_dir / 'agency_metrics.json'
-        metrics.to_json(metrics_file, orient='records', indent=2)
-        print(f"  ✅ Exported {len(metrics)} agency metrics")
-        
-        # Export time series
-        time_series = self.conn.execute("SELECT * FROM export_correction_time_series").fetchdf()
-        ts_file = output_dir / 'time_series.json'
-        time_series.to_json(ts_file, orient='records', indent=2)
-        print(f"  ✅ Exported {len(time_series)} time series records")
-        
-        print(f"\n✅ Export complete: {output_dir}")
+        exports = {
+            'agencies': ('export_agencies', 'agencies.json'),
+            'corrections': ('export_corrections', 'corrections.json'),
+            'agency metrics': ('export_agency_metrics', 'agency_metrics.json'),
+            'time series records': ('export_correction_time_series', 'time_series.json'),
+        }
+        
+        counts = {
+            label: self._copy_to_json(view, output_dir / filename)
+            for label, (view, filename) in exports.items()
+        }
+        
+        logger.info(
+            "Exported analytics to %s: %s",
+            output_dir,
+            ", ".join(f"{count} {label}" for label, count in counts.items()),
+        )
+        return counts
+
+
+# Lag averages are stored at full precision and rounded only for output,
+# half away from zero like DuckDB's ROUND (Python's round() is half-even
+# on the binary value, so 113.25 would come out as 113.2 instead of 113.3)
+_LAG_AVERAGE_FIELDS = ('avg_lag_days', 'avg_correction_lag_days')
+_LAG_AVERAGE_PLACES = Decimal('0.1')
+
+
+def _round_lag_average(value: float) -> float:
+    """Round a lag average to 0.1 day the way DuckDB's ROUND(value, 1) does."""
+    return float(Decimal(str(value)).quantize(_LAG_AVERAGE_PLACES, rounding=ROUND_HALF_UP))
 
 
-def main():
+def _round_lag_averages(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a summary report with lag averages rounded to 0.1 day."""
+    rounded = {}
+    for section, value in report.items():
+        if isinstance(value, list):
+            value = [
+                {
+                    key: _round_lag_average(val) if key in _LAG_AVERAGE_FIELDS and val is not None else val
+                    for key, val in row.items()
+                }
+                for row in value
+            ]
+        rounded[section] = value
+    return rounded
+
+
+def main(argv: List[str] = None):
     """Run analytics and generate reports."""
-    print("=" * 60)
-    print("eCFR Analytics Engine")
-    print("=" * 60)
+    parser = argparse.ArgumentParser(description="eCFR Analytics Engine")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="log progress and the report summary to stderr"
+    )
+    args = parser.parse_args(argv)
+    
+    # Configure the root logger; a no-op if the host already configured one
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(message)s'
+    )
     
     db_path = Path(__file__).parent / 'ecfr_analytics.duckdb'
     
     if not db_path.exists():
-        print(f"❌ Database not found: {db_path}")
-        print("Run ingestion.py first to create the database.")
+        logger.error(
+            "Database not found: %s\nRun ingestion.py first to create the database.",
+            db_path
+        )
         return
     
     analytics = ECFRAnalytics(str(db_path))
@@ -335,26 +575,34 @@ def main():
         analytics.connect()
         
         # Generate summary report
-        print("\n📊 Generating Summary Report...")
         report = analytics.generate_summary_report()
         
-        print(f"\n--- Overview ---")
-        print(f"Total Agencies: {report['overview']['total_agencies']}")
-        print(f"Total Corrections: {report['overview']['total_corrections']}")
-        print(f"Total CFR References: {report['overview']['total_cfr_references']}")
-        print(f"Year Range: {report['overview']['year_range'][0]} - {report['overview']['year_range'][1]}")
-        
-        print(f"\n--- Top 10 Agencies by Corrections ---")
-        for agency in report['top_agencies_by_corrections']:
-            print(f"  {agency['name']}: {agency['total_corrections']} corrections")
-        
-        print(f"\n--- Top 10 Agencies by RVI (Regulatory Volatility) ---")
-        for agency in report['top_agencies_by_rvi']:
-            print(f"  {agency['name']}: RVI {agency['rvi']} ({agency['total_corrections']} corrections / {agency['cfr_reference_count']} refs)")
-        
-        print(f"\n--- Recent Yearly Trends ---")
-        for trend in report['yearly_trends'][-5:]:
-            print(f"  {trend['year']}: {trend['correction_count']} corrections (avg lag: {trend['avg_lag_days']} days)")
+        if logger.isEnabledFor(logging.INFO):
+            overview = report['overview']
+            lines = [
+                "--- Overview ---",
+                f"Total Agencies: {overview['total_agencies']}",
+                f"Total Corrections: {overview['total_corrections']}",
+                f"Total CFR References: {overview['total_cfr_references']}",
+                f"Year Range: {overview['year_range'][0]} - {overview['year_range'][1]}",
+                "",
+                "--- Top 10 Agencies by Corrections ---",
+            ]
+            lines += [
+                f"  {agency['name']}: {agency['total_corrections']} corrections"
+                for agency in report['top_agencies_by_corrections']
+            ]
+            lines += ["", "--- Top 10 Agencies by RVI (Regulatory Volatility) ---"]
+            lines += [
+                f"  {agency['name']}: RVI {agency['rvi']} ({agency['total_corrections']} corrections / {agency['cfr_reference_count']} refs)"
+                for agency in report['top_agencies_by_rvi']
+            ]
+            lines += ["", "--- Recent Yearly Trends ---"]
+            lines += [
+                f"  {trend['year']}: {trend['correction_count']} corrections (avg lag: {trend['avg_lag_days']:.1f} days)"
+                for trend in report['yearly_trends'][-5:]
+            ]
+            logger.info("\n".join(lines))
         
         # Export for PostgreSQL
         export_dir = Path(__file__).parent / 'exports'
@@ -362,13 +610,11 @@ def main():
         
         # Save full report
         report_file = export_dir / 'summary_report.json'
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
-        print(f"\n✅ Full report saved: {report_file}")
-        
-        print("\n" + "=" * 60)
-        print("✅ Analytics complete!")
-        print("=" * 60)
+        with open(report_file, 'wb') as f:
+            f.write(orjson.dumps(
+                _round_lag_averages(report), default=str, option=orjson.OPT_INDENT_2
+            ))
+        logger.info("Full report saved: %s", report_file)
         
     finally:
         analytics.close()
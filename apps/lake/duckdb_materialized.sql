@@ -0,0 +1,153 @@
+-- DuckDB materialized aggregates for eCFR analytics
+-- Purpose: Precompute expensive aggregations once the raw data is loaded.
+-- Run after ingestion; every table is fully rebuilt (CREATE OR REPLACE),
+-- so the analytics layer reads stored results instead of re-aggregating.
+
+-- ============================================================================
+-- WORD COUNT ESTIMATES
+-- ============================================================================
+
+-- Estimated words per agency using the tiered CFR hierarchy model:
+-- part-level ~2,000, chapter-level ~10,000, title-level ~50,000 words.
+-- Aggregated on the SMALLINT slug_id alone (the weight depends only on which
+-- hierarchy columns are set); the slug string is resolved once per agency.
+CREATE OR REPLACE TABLE agency_word_counts AS
+SELECT 
+    a.slug as agency_slug,
+    wc.words
+FROM (
+    SELECT 
+        slug_id,
+        SUM(CASE 
+            WHEN part IS NOT NULL THEN 2000
+            WHEN chapter IS NOT NULL THEN 10000
+            ELSE 50000
+        END) as words
+    FROM cfr_references
+    GROUP BY slug_id
+) wc
+INNER JOIN agencies_parsed a ON a.slug_id = wc.slug_id;
+
+-- ============================================================================
+-- ANALYTICS TABLES
+-- ============================================================================
+
+-- Distinct CFR titles referenced by each agency (agency -> corrections join key)
+DROP INDEX IF EXISTS idx_agency_titles_slug_id;
+CREATE OR REPLACE TABLE agency_titles AS
+SELECT DISTINCT slug_id, title
+FROM cfr_references;
+
+CREATE INDEX idx_agency_titles_slug_id ON agency_titles(slug_id);
+
+-- Agency metrics summary
+CREATE OR REPLACE TABLE agency_metrics AS
+WITH agency_corrections AS (
+    SELECT 
+        at.slug_id,
+        COUNT(DISTINCT c.ecfr_id) as total_corrections,
+        COUNT(DISTINCT c.year) as years_with_corrections,
+        MIN(c.year) as first_correction_year,
+        MAX(c.year) as last_correction_year,
+        AVG(c.lag_days) as avg_correction_lag_days
+    FROM agency_titles at
+    INNER JOIN corrections_parsed c ON c.title = at.title
+    GROUP BY at.slug_id
+)
+SELECT 
+    a.slug,
+    a.name,
+    a.short_name,
+    a.parent_slug,
+    a.cfr_reference_count,
+    a.child_count,
+    COALESCE(ac.total_corrections, 0) as total_corrections,
+    COALESCE(ac.years_with_corrections, 0) as years_with_corrections,
+    ac.first_correction_year,
+    ac.last_correction_year,
+    ac.avg_correction_lag_days,
+    -- Regulatory Volatility Index (RVI)
+    CASE 
+        WHEN a.cfr_reference_count > 0 AND ac.total_corrections > 0
+        THEN ROUND((ac.total_corrections::DECIMAL / a.cfr_reference_count) * 100, 2)
+        ELSE 0 
+    END as rvi
+FROM agencies_parsed a
+LEFT JOIN agency_corrections ac ON ac.slug_id = a.slug_id;
+
+-- Correction trends by year
+CREATE OR REPLACE TABLE correction_trends_yearly AS
+SELECT 
+    year,
+    COUNT(*) as correction_count,
+    COUNT(DISTINCT title) as unique_titles,
+    AVG(lag_days) as avg_lag_days,
+    MIN(lag_days) as min_lag_days,
+    MAX(lag_days) as max_lag_days
+FROM corrections_parsed
+WHERE lag_days IS NOT NULL
+GROUP BY year
+ORDER BY year;
+
+-- Correction trends by title (CFR title)
+CREATE OR REPLACE TABLE correction_trends_by_title AS
+SELECT 
+    title,
+    COUNT(*) as correction_count,
+    COUNT(DISTINCT year) as years_active,
+    MIN(year) as first_year,
+    MAX(year) as last_year,
+    AVG(lag_days) as avg_lag_days
+FROM corrections_parsed
+GROUP BY title
+ORDER BY correction_count DESC;
+
+-- Monthly correction activity (for time series charts)
+CREATE OR REPLACE TABLE correction_time_series AS
+SELECT 
+    year,
+    MONTH(error_corrected) as month,
+    COUNT(*) as correction_count,
+    AVG(lag_days) as avg_lag_days
+FROM corrections_parsed
+WHERE error_corrected IS NOT NULL
+GROUP BY year, MONTH(error_corrected)
+ORDER BY year, month;
+
+-- Top agencies by correction frequency
+CREATE OR REPLACE VIEW top_agencies_by_corrections AS
+SELECT 
+    slug,
+    name,
+    short_name,
+    total_corrections as correction_count,
+    cfr_reference_count,
+    rvi
+FROM agency_metrics
+WHERE total_corrections > 0
+ORDER BY total_corrections DESC
+LIMIT 50;
+
+-- ============================================================================
+-- EXPORT TABLES (Ready for PostgreSQL)
+-- ============================================================================
+
+-- Export: Agency metrics
+CREATE OR REPLACE VIEW export_agency_metrics AS
+SELECT 
+    ROW_NUMBER() OVER (ORDER BY slug) as id,
+    slug as agency_slug,
+    CURRENT_DATE as metric_date,
+    0 as word_count,  -- TODO: Implement word counting
+    total_corrections as correction_count,
+    rvi
+FROM agency_metrics;
+
+-- Export: Time series
+CREATE OR REPLACE VIEW export_correction_time_series AS
+SELECT 
+    year,
+    month,
+    correction_count,
+    avg_lag_days
+FROM correction_time_series;
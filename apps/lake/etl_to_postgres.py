@@ -14,6 +14,10 @@ import psycopg2
 from psycopg2.extras import execute_batch
 
 
+# Rows pulled from DuckDB per batch when streaming large tables
+FETCH_BATCH_ROWS = 50_000
+
+
 class DuckDBToPostgresETL:
     """ETL pipeline from DuckDB analytics to PostgreSQL."""
     
@@ -143,8 +147,8 @@ class DuckDBToPostgresETL:
         """Transfer corrections from DuckDB to PostgreSQL."""
         print("\n📤 Transferring corrections...")
         
-        # Fetch from DuckDB
-        corrections = self.duck_conn.execute("""
+        # Stream from DuckDB in batches so only one batch is held in memory
+        result = self.duck_conn.execute("""
             SELECT 
                 ecfr_id,
                 cfr_reference,
@@ -161,7 +165,7 @@ class DuckDBToPostgresETL:
                 checksum
             FROM corrections_parsed
             ORDER BY id
-        """).fetchall()
+        """)
         
         cursor = self.pg_conn.cursor()
         
@@ -174,28 +178,28 @@ class DuckDBToPostgresETL:
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         
-        execute_batch(cursor, insert_sql, corrections, page_size=100)
+        count = 0
+        while True:
+            corrections = result.fetchmany(FETCH_BATCH_ROWS)
+            if not corrections:
+                break
+            execute_batch(cursor, insert_sql, corrections, page_size=100)
+            count += len(corrections)
+        
         self.pg_conn.commit()
         cursor.close()
         
-        print(f"  ✅ Transferred {len(corrections)} corrections")
-        return len(corrections)
+        print(f"  ✅ Transferred {count} corrections")
+        return count
     
     def transfer_agency_metrics(self):
         """Transfer agency metrics from DuckDB to PostgreSQL."""
         print("\n📤 Transferring agency metrics...")
         
-        # Calculate word counts using tiered estimation
+        # Word counts are precomputed at ingestion (tiered estimation)
         word_counts_query = self.duck_conn.execute("""
-            SELECT 
-                agency_slug,
-                SUM(CASE 
-                    WHEN part IS NOT NULL THEN 2000
-                    WHEN chapter IS NOT NULL THEN 10000
-                    ELSE 50000
-                END) as word_count
-            FROM cfr_references
-            GROUP BY agency_slug
+            SELECT agency_slug, words
+            FROM agency_word_counts
         """).fetchall()
         
         word_counts_dict = {slug: count for slug, count in word_counts_query}
@@ -15,6 +15,22 @@ import duckdb
 from checksums import add_checksums_to_agencies, add_checksums_to_corrections
 
 
+MATERIALIZED_SQL_PATH = Path(__file__).parent / 'duckdb_materialized.sql'
+
+
+def run_materialized_sql(conn: duckdb.DuckDBPyConnection):
+    """
+    Rebuild precomputed aggregate tables on a writable connection.
+    
+    Every statement in duckdb_materialized.sql replaces its table or view,
+    so this is safe to run repeatedly against the same database.
+    """
+    with open(MATERIALIZED_SQL_PATH, 'r') as f:
+        materialized_sql = f.read()
+    
+    conn.execute(materialized_sql)
+
+
 class ECFRIngestion:
     """Manages ingestion of eCFR data into DuckDB."""
     
@@ -50,6 +66,11 @@ class ECFRIngestion:
         self.conn.execute(schema_sql)
         print("✅ Initialized DuckDB schema")
     
+    def materialize_aggregates(self):
+        """Rebuild precomputed aggregate tables from the loaded data."""
+        run_materialized_sql(self.conn)
+        print("✅ Materialized aggregate tables")
+    
     def calculate_file_checksum(self, file_path: Path) -> str:
         """Calculate SHA-256 checksum of entire file."""
         sha256 = hashlib.sha256()
@@ -80,9 +101,13 @@ class ECFRIngestion:
         
         parent_count = 0
         sub_count = 0
+        slug_id = 0  # Sequential SMALLINT key, one per agency
         
         # Insert parent agencies
         for idx, agency in enumerate(data['agencies'], start=1):
+            slug_id += 1
+            agency_slug_id = slug_id
+            
             self.conn.execute("""
                 INSERT INTO agencies_raw (id, slug, name, short_name, parent_slug, data, checksum)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -98,11 +123,12 @@ class ECFRIngestion:
             
             # Parse into structured table
             self.conn.execute("""
-                INSERT INTO agencies_parsed (id, slug, name, short_name, parent_slug, 
+                INSERT INTO agencies_parsed (id, slug_id, slug, name, short_name, parent_slug, 
                                             cfr_reference_count, child_count, checksum)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, [
                 idx,
+                agency_slug_id,
                 agency['slug'],
                 agency['name'],
                 agency.get('short_name'),
@@ -115,10 +141,11 @@ class ECFRIngestion:
             # Insert CFR references
             for cfr_ref in agency.get('cfr_references', []):
                 self.conn.execute("""
-                    INSERT INTO cfr_references (agency_slug, title, chapter, subtitle, part)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO cfr_references (agency_slug, slug_id, title, chapter, subtitle, part)
+                    VALUES (?, ?, ?, ?, ?, ?)
                 """, [
                     agency['slug'],
+                    agency_slug_id,
                     cfr_ref.get('title'),
                     cfr_ref.get('chapter'),
                     cfr_ref.get('subtitle'),
@@ -130,6 +157,8 @@ class ECFRIngestion:
             # Insert sub-agencies (children)
             for child_idx, child in enumerate(agency.get('children', []), start=1):
                 child_id = idx * 1000 + child_idx  # Unique ID for children
+                slug_id += 1
+                child_slug_id = slug_id
                 
                 self.conn.execute("""
                     INSERT INTO agencies_raw (id, slug, name, short_name, parent_slug, data, checksum)
@@ -145,11 +174,12 @@ class ECFRIngestion:
                 ])
                 
                 self.conn.execute("""
-                    INSERT INTO agencies_parsed (id, slug, name, short_name, parent_slug, 
+                    INSERT INTO agencies_parsed (id, slug_id, slug, name, short_name, parent_slug, 
                                                 cfr_reference_count, child_count, checksum)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, [
                     child_id,
+                    child_slug_id,
                     child['slug'],
                     child['name'],
                     child.get('short_name'),
@@ -162,10 +192,11 @@ class ECFRIngestion:
                 # Insert CFR references for child
                 for cfr_ref in child.get('cfr_references', []):
                     self.conn.execute("""
-                        INSERT INTO cfr_references (agency_slug, title, chapter, subtitle, part)
-                        VALUES (?, ?, ?, ?, ?)
+                        INSERT INTO cfr_references (agency_slug, slug_id, title, chapter, subtitle, part)
+                        VALUES (?, ?, ?, ?, ?, ?)
                     """, [
                         child['slug'],
+                        child_slug_id,
                         cfr_ref.get('title'),
                         cfr_ref.get('chapter'),
                         cfr_ref.get('subtitle'),
@@ -363,6 +394,9 @@ def main():
         pipeline.load_agencies(agencies_json)
         pipeline.load_corrections(corrections_json)
         
+        # Precompute aggregates
+        pipeline.materialize_aggregates()
+        
         # Verify
         pipeline.verify_data()
         
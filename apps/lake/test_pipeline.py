@@ -8,7 +8,10 @@ Validates:
 - Export data quality
 """
 
+import asyncio
 import json
+import shutil
+import tempfile
 from pathlib import Path
 import duckdb
 
@@ -201,6 +204,27 @@ def test_analytics_calculations():
         
         print(f"  ✅ Yearly trend aggregation verified (2024: {count} corrections)")
     
+    # Test 4: Materialized word counts match the tiered estimate
+    mismatched = conn.execute("""
+        SELECT COUNT(*)
+        FROM agency_word_counts wc
+        JOIN (
+            SELECT
+                agency_slug,
+                SUM(CASE
+                    WHEN part IS NOT NULL THEN 2000
+                    WHEN chapter IS NOT NULL THEN 10000
+                    ELSE 50000
+                END) as expected_words
+            FROM cfr_references
+            GROUP BY agency_slug
+        ) e ON e.agency_slug = wc.agency_slug
+        WHERE wc.words != e.expected_words
+    """).fetchone()[0]
+    
+    assert mismatched == 0, f"Found {mismatched} agencies with incorrect word counts"
+    print(f"  ✅ Word count estimates verified")
+    
     conn.close()
 
 
@@ -256,6 +280,16 @@ def test_export_data():
     
     print(f"  ✅ Correction export count matches database: {len(corrections_export)}")
     
+    # Test 4: Report lag averages round the same way as DuckDB's ROUND
+    from analytics import _round_lag_average
+    
+    for value in (113.25, 148.95, 0.05, 2.349, 70.0):
+        expected = conn.execute("SELECT ROUND(?::DOUBLE, 1)", [value]).fetchone()[0]
+        assert _round_lag_average(value) == expected, \
+            f"Lag average rounding mismatch for {value}: {_round_lag_average(value)} != {expected}"
+    
+    print(f"  ✅ Report lag averages round half away from zero like DuckDB")
+    
     conn.close()
 
 
@@ -277,6 +311,16 @@ def test_data_relationships():
     assert orphan_refs == 0, f"Found {orphan_refs} CFR references with invalid agency links"
     print(f"  ✅ All CFR references link to valid agencies")
     
+    mismatched_ids = conn.execute("""
+        SELECT COUNT(*)
+        FROM cfr_references cfr
+        JOIN agencies_parsed a ON cfr.agency_slug = a.slug
+        WHERE cfr.slug_id != a.slug_id
+    """).fetchone()[0]
+    
+    assert mismatched_ids == 0, f"Found {mismatched_ids} CFR references with mismatched slug_id"
+    print(f"  ✅ All CFR reference slug_ids match their agency")
+    
     # Test 2: Parent-child relationships are valid
     invalid_parents = conn.execute("""
         SELECT COUNT(*)
@@ -310,6 +354,186 @@ def test_data_relationships():
     conn.close()
 
 
+def _copy_database(tmp_dir: str) -> str:
+    """Copy the pipeline database so tests can write to it."""
+    db_path = Path(__file__).parent / 'ecfr_analytics.duckdb'
+    copy_path = Path(tmp_dir) / 'ecfr_analytics.duckdb'
+    shutil.copy(db_path, copy_path)
+    return str(copy_path)
+
+
+def test_refresh_materialized():
+    """Test that materialized tables can be rebuilt in place."""
+    print("\n🧪 Testing Materialized Refresh...")
+    
+    from analytics import ECFRAnalytics
+    
+    tables = ['agency_word_counts', 'agency_titles', 'agency_metrics',
+              'correction_trends_yearly', 'correction_trends_by_title',
+              'correction_time_series']
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = _copy_database(tmp_dir)
+        
+        conn = duckdb.connect(db_path, read_only=True)
+        expected = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables}
+        conn.close()
+        
+        # Running the materialized script twice must succeed and be stable
+        analytics = ECFRAnalytics(db_path)
+        analytics.refresh_materialized()
+        analytics.refresh_materialized()
+        
+        conn = duckdb.connect(db_path, read_only=True)
+        for table in tables:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            assert count == expected[table], \
+                f"Row count changed for {table} after refresh: {count} != {expected[table]}"
+        conn.close()
+    
+    print(f"  ✅ Refreshed {len(tables)} materialized tables twice")
+
+
+def test_analytics_queries():
+    """Test agency lookups and parameterized limits in the analytics API."""
+    print("\n🧪 Testing Analytics Queries...")
+    
+    from analytics import ECFRAnalytics
+    
+    db_path = Path(__file__).parent / 'ecfr_analytics.duckdb'
+    analytics = ECFRAnalytics(str(db_path))
+    analytics.connect()
+    
+    try:
+        known = analytics.get_agency_metrics(limit=1)[0]['slug']
+        unknown = 'no-such-agency'
+        
+        # Test 1: Unknown slugs short-circuit to empty results
+        assert analytics.get_agency_detail(unknown) is None, \
+            "Unknown slug should return None from get_agency_detail"
+        assert analytics.get_corrections_for_agency(unknown) == [], \
+            "Unknown slug should return [] from get_corrections_for_agency"
+        assert analytics.get_agency_detail(known)['slug'] == known, \
+            f"Known slug {known} not found by get_agency_detail"
+        
+        print(f"  ✅ Unknown slugs return empty results")
+        
+        # Test 2: Bulk lookup returns only known slugs
+        details = analytics.get_agency_details([known, unknown])
+        assert list(details) == [known], \
+            f"get_agency_details returned {list(details)}, expected [{known!r}]"
+        
+        print(f"  ✅ Bulk agency lookup returns only known slugs")
+        
+        # Test 3: Bound LIMIT returns the requested number of rows
+        total_agencies = len(analytics.get_agency_metrics())
+        total_titles = len(analytics.get_correction_trends_by_title(limit=1000))
+        
+        for limit in (1, 3):
+            assert len(analytics.get_agency_metrics(limit=limit)) == min(limit, total_agencies), \
+                f"get_agency_metrics(limit={limit}) returned the wrong number of rows"
+            assert len(analytics.get_correction_trends_by_title(limit=limit)) == min(limit, total_titles), \
+                f"get_correction_trends_by_title(limit={limit}) returned the wrong number of rows"
+        
+        corrections = analytics.get_corrections_for_agency(known, limit=2)
+        assert len(corrections) <= 2, \
+            f"get_corrections_for_agency(limit=2) returned {len(corrections)} rows"
+        
+        print(f"  ✅ LIMIT parameters return the requested row counts")
+        
+        # Test 4: Column-wise time series matches the row-wise getter
+        rows = analytics.get_time_series_data()
+        columns = analytics.get_time_series_columns()
+        fields = ['year', 'month', 'correction_count', 'avg_lag_days']
+        
+        assert list(columns) == fields, \
+            f"get_time_series_columns returned keys {list(columns)}, expected {fields}"
+        
+        for field in fields:
+            # tolist() turns masked NULLs into None, matching the row-wise records
+            values = columns[field].tolist()
+            assert len(values) == len(rows), \
+                f"Column {field} has {len(values)} values, expected {len(rows)}"
+            assert values == [row[field] for row in rows], \
+                f"Column {field} does not match get_time_series_data"
+        
+        print(f"  ✅ Time series columns match {len(rows)} row-wise records")
+        
+        # Test 5: Failed connect leaves no shared handle behind
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            empty_path = str(Path(tmp_dir) / 'empty.duckdb')
+            duckdb.connect(empty_path).close()
+            
+            broken = ECFRAnalytics(empty_path)
+            for _ in range(2):
+                try:
+                    broken.connect()
+                    assert False, "connect() succeeded without an agencies_parsed table"
+                except duckdb.CatalogException:
+                    pass
+            
+            assert empty_path not in ECFRAnalytics._connections, \
+                "Failed connect() left the shared handle registered"
+            duckdb.connect(empty_path).close()
+        
+        print(f"  ✅ Failed connect releases the database")
+    finally:
+        analytics.close()
+
+
+def test_summary_report_cache():
+    """Test that summary reports are cached until the data is refreshed."""
+    print("\n🧪 Testing Summary Report Cache...")
+    
+    from analytics import ECFRAnalytics
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = _copy_database(tmp_dir)
+        
+        analytics = ECFRAnalytics(db_path)
+        analytics.connect()
+        
+        # Count how often the report queries actually run
+        builds = []
+        build = analytics._build_summary_report
+        analytics._build_summary_report = lambda: builds.append(1) or build()
+        
+        try:
+            first = analytics.generate_summary_report()
+            second = analytics.generate_summary_report()
+            
+            assert len(builds) == 1, f"Expected a cache hit, report built {len(builds)} times"
+            assert first == second, "Cached report differs from the original"
+            print(f"  ✅ Second report served from cache")
+            
+            async_report = asyncio.run(analytics.generate_summary_report_async())
+            
+            assert len(builds) == 1, "Async report did not use the cache"
+            assert async_report == first, "Async report differs from the sync report"
+            print(f"  ✅ Async report served from the same cache")
+            
+            # Refresh is refused while another reader holds the database
+            other = ECFRAnalytics(db_path)
+            other.connect()
+            try:
+                analytics.refresh_materialized()
+                assert False, "refresh_materialized ran while another reader was connected"
+            except RuntimeError:
+                pass
+            finally:
+                other.close()
+            
+            print(f"  ✅ Refresh refused while other readers are connected")
+            
+            analytics.refresh_materialized()
+            analytics.generate_summary_report()
+            
+            assert len(builds) == 2, "refresh_materialized did not invalidate the cached report"
+            print(f"  ✅ Refresh invalidates the cached report")
+        finally:
+            analytics.close()
+
+
 def run_all_tests():
     """Run all pipeline tests."""
     print("=" * 60)
@@ -322,6 +546,9 @@ def run_all_tests():
         ("Analytics Calculations", test_analytics_calculations),
         ("Export Data", test_export_data),
         ("Data Relationships", test_data_relationships),
+        ("Analytics Queries", test_analytics_queries),
+        ("Materialized Refresh", test_refresh_materialized),
+        ("Summary Report Cache", test_summary_report_cache),
     ]
     
     passed = 0